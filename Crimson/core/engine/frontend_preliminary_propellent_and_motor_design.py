@@ -1,4 +1,4 @@
-from core.models.preliminary_propellent_and_motor_design.py import calculate_motor_parameters
+from core.models.preliminary_propellent_and_motor_design import calculate_motor_parameters
 
 def get_float(prompt):
     while True:
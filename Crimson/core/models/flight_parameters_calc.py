@@ -1,4 +1,4 @@
-import math
+import numpy as np
 #SI 
 
 GRAVITY = 9.806650
@@ -17,12 +17,14 @@ def to_be_named(
         burnout_displacement = 0.5 * acceleration * burn_time ** 2       # z1 = 1/2 a t² (m)
         burnout_velocity = acceleration * burn_time                       # V1 = a t (m/s)
         equivalent_displacement = (average_thrust * burnout_displacement) / (total_mass * GRAVITY)  # z2 = F z1 / (m g) (m)
-        adjusted_time = burn_time + math.sqrt(2 * (equivalent_displacement - burnout_displacement) / GRAVITY)  # t2 = t + sqrt[2 (z2 - z1) / g] (s)
+        if np.any(np.real(equivalent_displacement - burnout_displacement) < 0):
+                raise ValueError("Negative value under square root in adjusted time. Check inputs.")
+        adjusted_time = burn_time + np.sqrt(2 * (equivalent_displacement - burnout_displacement) / GRAVITY)  # t2 = t + sqrt[2 (z2 - z1) / g] (s)
         drag_influence_number = (drag_coefficient * diameter ** 2 * burnout_velocity ** 2) / (1000 * dead_mass)  # N = Cd D² V1² / (1000 md) (dimensionless)
 
-        drag_reduction_factor_peak_altitude = math.exp(-0.000650 * drag_influence_number)     # fz(N) (dimensionless)
-        drag_reduction_factor_burnout_velocity = math.exp(-0.000300 * drag_influence_number)  # fv(N) (dimensionless)
-        drag_reduction_factor_time_to_apogee = math.exp(-0.000700 * drag_influence_number)    # ft(N) (dimensionless)
+        drag_reduction_factor_peak_altitude = np.exp(-0.000650 * drag_influence_number)     # fz(N) (dimensionless)
+        drag_reduction_factor_burnout_velocity = np.exp(-0.000300 * drag_influence_number)  # fv(N) (dimensionless)
+        drag_reduction_factor_time_to_apogee = np.exp(-0.000700 * drag_influence_number)    # ft(N) (dimensionless)
 
         ideal_peak_altitude = drag_reduction_factor_peak_altitude * equivalent_displacement  # zpeak = fz(N) * z2 (m)
         corrected_burnout_velocity = drag_reduction_factor_burnout_velocity * burnout_velocity # Vmax = fv(N) * V1 (m/s)
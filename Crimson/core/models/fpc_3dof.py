@@ -0,0 +1,354 @@
+import numpy as np
+
+from core.models.fpc_phase2 import Phase2RocketSimulator, RocketModel, linear_thrust
+
+
+def _first_downward_crossing(values, level):
+    """
+    First sample interval in which each column of values drops through level.
+    Inputs:
+        values: Samples (n_samples x n_cases)
+        level: Crossing level
+    Returns:
+        Interval index and interpolation fraction within the interval (nan
+        for cases that never cross)
+    """
+    above = values > level
+    crossing = above[:-1] & ~above[1:]
+    found = crossing.any(axis=0)
+    k = np.argmax(crossing, axis=0)
+    cases = np.arange(values.shape[1])
+    v0, v1 = values[k, cases], values[k + 1, cases]
+    frac = np.where(found, (v0 - level) / np.where(v0 != v1, v0 - v1, 1.0), np.nan)
+    return k, frac
+
+
+class Phase3DofRocketSimulator(RocketModel):
+    """
+    Planar/3-DOF point-mass trajectory with a launch rail and wind.
+    Axes are east, north, up with the pad at the origin. On the rail the
+    rocket only moves along the rail; once off it the thrust points into the
+    air-relative velocity (weathercocking) and drag acts against it.
+
+    Wind is tabulated against altitude. wind_east and wind_north may each be
+    omitted (calm), 1-D (one case) or 2-D (altitude levels x cases) and are
+    broadcast against each other; all cases are integrated together as one
+    array-valued ODE, so thousands of wind-perturbed runs cost one solve_ivp
+    call.
+    """
+
+    def __init__(self, md, mp, D, burn_time, thrust_func,
+                 rail_length=1.0,          # m
+                 rail_elevation_deg=85.0,  # degrees above horizontal
+                 rail_azimuth_deg=0.0,     # degrees clockwise from north
+                 wind_altitudes=(0.0,),    # m
+                 wind_east=None,           # m/s, wind blowing towards east
+                 wind_north=None):         # m/s, wind blowing towards north
+        super().__init__(md, mp, D, burn_time, thrust_func)
+        self.rail_length = rail_length
+        elevation = np.radians(rail_elevation_deg)
+        azimuth = np.radians(rail_azimuth_deg)
+        self.rail_direction = np.array([
+            np.cos(elevation) * np.sin(azimuth),
+            np.cos(elevation) * np.cos(azimuth),
+            np.sin(elevation),
+        ])
+
+        self.wind_altitudes = np.asarray(wind_altitudes, dtype=float)
+        n_levels = len(self.wind_altitudes)
+        components = []
+        for component in (wind_east, wind_north):
+            component = np.zeros(n_levels) if component is None else np.asarray(component, dtype=float)
+            components.append(component.reshape(n_levels, -1))
+        self.wind_east, self.wind_north = np.broadcast_arrays(*components)
+        self.n_cases = self.wind_east.shape[1]
+        self.batched = any(np.ndim(c) == 2 for c in (wind_east, wind_north))
+
+    def wind(self, z):
+        # Linear interpolation in altitude, held constant outside the table
+        h = self.wind_altitudes
+        if len(h) == 1:
+            return self.wind_east[0], self.wind_north[0]
+        k = np.clip(np.searchsorted(h, z) - 1, 0, len(h) - 2)
+        w = np.clip((z - h[k]) / (h[k + 1] - h[k]), 0.0, 1.0)
+        cases = np.arange(self.n_cases)
+        east = self.wind_east[k, cases] * (1 - w) + self.wind_east[k + 1, cases] * w
+        north = self.wind_north[k, cases] * (1 - w) + self.wind_north[k + 1, cases] * w
+        return east, north
+
+    def derivatives(self, t, y):
+        # y is the flattened (6 x n_cases) state [x, y, z, vx, vy, vz]
+        state = y.reshape(6, -1)
+        position, velocity = state[:3], state[3:]
+        z = position[2]
+        u = self.rail_direction[:, None]
+
+        m = self.mass(t)
+        F = self.thrust(t)
+        wind_east, wind_north = self.wind(z)
+        v_air = velocity - np.array([wind_east, wind_north, np.zeros_like(z)])
+        airspeed = np.sqrt(np.sum(v_air ** 2, axis=0))
+
+        on_rail = np.sum(position * u, axis=0) < self.rail_length
+        heading = np.where(on_rail | (airspeed < 1e-9), u, v_air / np.maximum(airspeed, 1e-9))
+
+        accel = (F / m) * heading - 0.5 * self.Cd(z) * self.rho(z) * self.A * airspeed * v_air / m
+        accel[2] -= self.g(z)
+
+        # On the rail only the along-rail component acts, and the rocket
+        # cannot slide back down before thrust exceeds weight.
+        rail_accel = np.sum(accel * u, axis=0)
+        rail_speed = np.sum(velocity * u, axis=0)
+        rail_accel = np.where((rail_speed <= 0) & (rail_accel < 0), 0.0, rail_accel)
+        accel = np.where(on_rail, u * rail_accel, accel)
+
+        # Cases that have already landed keep falling below ground until the
+        # last one lands; stopping them here would make the RHS discontinuous
+        # once per case and force the batched solver into tiny steps.
+        return np.concatenate([velocity, accel]).ravel()
+
+    def simulate(self, t_max=600.0, rtol=1e-6, atol=1e-6, max_step=1.0, rail_step=0.002):
+        from scipy.integrate import solve_ivp
+
+        y0 = np.zeros(6 * self.n_cases)
+
+        # --- Rail Phase ---
+        # Short steps until every case has left the rail, so the exit is
+        # resolved even where the constraint puts no kink in the RHS (e.g. a
+        # vertical rail in calm air) and the solver would step right over it.
+        def all_off_rail(t, y): return np.min(self.rail_direction @ y.reshape(6, -1)[:3]) - self.rail_length
+        all_off_rail.terminal = True
+        all_off_rail.direction = 1
+
+        sol_rail = solve_ivp(
+            self.derivatives,
+            [0, self.burn_time],
+            y0,
+            events=all_off_rail,
+            rtol=rtol,
+            atol=atol,
+            max_step=rail_step
+        )
+        segments = [sol_rail]
+
+        # --- Burn Phase ---
+        if sol_rail.status == 1:
+            segments.append(solve_ivp(
+                self.derivatives,
+                [sol_rail.t[-1], self.burn_time],
+                sol_rail.y[:, -1],
+                rtol=rtol,
+                atol=atol
+            ))
+
+        # --- Coast and Descent ---
+        def all_landed(t, y): return np.max(y.reshape(6, -1)[2])
+        all_landed.terminal = True
+        all_landed.direction = -1
+
+        # Start just after burnout so the first step already sees no thrust
+        t_coast = np.nextafter(self.burn_time, np.inf)
+        sol_coast = solve_ivp(
+            self.derivatives,
+            [t_coast, t_coast + t_max],
+            segments[-1].y[:, -1],
+            events=all_landed,
+            rtol=rtol,
+            atol=atol,
+            max_step=max_step
+        )
+        segments.append(sol_coast)
+
+        t = np.concatenate([sol_rail.t] + [segment.t[1:] for segment in segments[1:]])
+        states = np.concatenate([sol_rail.y] + [segment.y[:, 1:] for segment in segments[1:]], axis=1)
+        east, north, up, v_east, v_north, v_up = states.reshape(6, self.n_cases, -1).transpose(0, 2, 1)
+        if sol_coast.status == 1:
+            # The event stops the last case exactly at the ground
+            up[-1] = np.minimum(up[-1], 0.0)
+        cases = np.arange(self.n_cases)
+        dt = np.diff(t)[:, None]
+
+        # Rail exit: along-rail distance reaches the rail length
+        along_rail = (east * self.rail_direction[0] + north * self.rail_direction[1]
+                      + up * self.rail_direction[2])
+        if sol_rail.status == 1:
+            # The event stops the last case exactly at the end of the rail
+            last = len(sol_rail.t) - 1
+            along_rail[last] = np.maximum(along_rail[last], self.rail_length)
+        k, frac = _first_downward_crossing(-along_rail, -self.rail_length)
+        speed = np.sqrt(v_east ** 2 + v_north ** 2 + v_up ** 2)
+        rail_exit_time = t[k] + frac * dt[k, 0]
+        rail_exit_velocity = speed[k, cases] + frac * (speed[k + 1, cases] - speed[k, cases])
+
+        # Apogee: vertical velocity through zero, altitude from the
+        # constant-acceleration arc through the bracketing samples
+        k, frac = _first_downward_crossing(v_up, 0.0)
+        tau = frac * dt[k, 0]
+        apogee_time = t[k] + tau
+        peak_altitude = up[k, cases] + 0.5 * v_up[k, cases] * tau
+
+        # Impact: altitude through zero
+        k, frac = _first_downward_crossing(up, 0.0)
+        impact_time = t[k] + frac * dt[k, 0]
+        landing_east = east[k, cases] + frac * (east[k + 1, cases] - east[k, cases])
+        landing_north = north[k, cases] + frac * (north[k + 1, cases] - north[k, cases])
+
+        # Ground track ends at the landing point
+        after_impact = (np.arange(len(t))[:, None] > k) & ~np.isnan(frac)
+        east = np.where(after_impact, landing_east, east)
+        north = np.where(after_impact, landing_north, north)
+        up = np.where(after_impact, 0.0, up)
+
+        results = {
+            "Rail Exit Velocity (m/s)": rail_exit_velocity,
+            "Time to Rail Exit (s)": rail_exit_time,
+            "Peak Altitude (m)": peak_altitude,
+            "Time to Apogee (s)": apogee_time,
+            "Time to Impact (s)": impact_time,
+            "Landing East (m)": landing_east,
+            "Landing North (m)": landing_north,
+            "Downrange (m)": np.hypot(landing_east, landing_north),
+        }
+        if not self.batched:
+            results = {key: value[0] for key, value in results.items()}
+            east, north, up = east[:, 0], north[:, 0], up[:, 0]
+
+        results["Ground Track"] = {
+            "Time (s)": t,
+            "East (m)": east,
+            "North (m)": north,
+            "Altitude (m)": up,
+        }
+        return results
+
+
+def test_vertical_calm_matches_phase2():
+    # With a vertical rail and no wind the 3-DOF apogee must match the 1-D model
+    nominal = dict(md=0.8, mp=0.2, D=0.05, burn_time=2.0, thrust_func=linear_thrust)
+    vertical = Phase2RocketSimulator(**nominal).simulate()
+    planar = Phase3DofRocketSimulator(**nominal, rail_elevation_deg=90.0).simulate(rtol=1e-9, atol=1e-9)
+    print(f"Peak Altitude (m): 1-D {vertical['Peak Altitude (m)']:.6f}, 3-DOF {planar['Peak Altitude (m)']:.6f}")
+    assert abs(planar["Peak Altitude (m)"] - vertical["Peak Altitude (m)"]) < 1e-4
+    assert abs(planar["Downrange (m)"]) < 1e-6
+
+
+def test_rail_exit():
+    # Rail exit against a tight-tolerance integration of the along-rail
+    # equation of motion, for a vertical and a tilted rail in calm air
+    from scipy.integrate import solve_ivp
+
+    nominal = dict(md=0.8, mp=0.2, D=0.05, burn_time=2.0, thrust_func=linear_thrust)
+    model = RocketModel(**nominal)
+    rail_length = 1.5
+
+    for elevation_deg in (90.0, 60.0):
+        sin_elevation = np.sin(np.radians(elevation_deg))
+
+        def along_rail(t, y):
+            s, v = y
+            z = s * sin_elevation
+            m = model.mass(t)
+            a = (model.thrust(t) / m - model.g(z) * sin_elevation
+                 - 0.5 * model.Cd(z) * model.rho(z) * model.A * v * abs(v) / m)
+            return [v, max(a, 0.0) if v <= 0 else a]
+
+        def rail_end(t, y): return y[0] - rail_length
+        rail_end.terminal = True
+
+        reference = solve_ivp(along_rail, [0, nominal["burn_time"]], [0.0, 0.0],
+                              events=rail_end, rtol=1e-12, atol=1e-12)
+        t_exit, v_exit = reference.t_events[0][0], reference.y_events[0][0][1]
+
+        results = Phase3DofRocketSimulator(**nominal, rail_length=rail_length,
+                                           rail_elevation_deg=elevation_deg).simulate()
+        print(f"{elevation_deg:.0f} deg rail: exit {results['Rail Exit Velocity (m/s)']:.6f} m/s "
+              f"at {results['Time to Rail Exit (s)']:.6f} s (reference {v_exit:.6f} m/s at {t_exit:.6f} s)")
+        assert abs(results["Rail Exit Velocity (m/s)"] - v_exit) < 1e-4 * v_exit
+        assert abs(results["Time to Rail Exit (s)"] - t_exit) < 1e-4 * t_exit
+
+
+def test_wind_table_shapes():
+    # Either wind component may be omitted, 1-D or 2-D; batched cases must
+    # reproduce the matching single-case runs.
+    nominal = dict(md=0.8, mp=0.2, D=0.05, burn_time=2.0, thrust_func=linear_thrust)
+    altitudes = [0.0, 100.0]
+    east_cases = np.array([[3.0, 0.0, -2.0], [5.0, 1.0, -4.0]])
+
+    assert Phase3DofRocketSimulator(**nominal, wind_altitudes=altitudes, wind_east=[3.0, 5.0]).n_cases == 1
+    assert Phase3DofRocketSimulator(**nominal, wind_altitudes=altitudes, wind_north=[3.0, 5.0]).n_cases == 1
+    assert Phase3DofRocketSimulator(**nominal, wind_altitudes=altitudes, wind_east=east_cases).n_cases == 3
+    mixed = Phase3DofRocketSimulator(**nominal, wind_altitudes=altitudes, wind_east=[1.0, 2.0], wind_north=east_cases)
+    assert mixed.batched and mixed.n_cases == 3
+
+    batch = Phase3DofRocketSimulator(**nominal, wind_altitudes=altitudes, wind_east=east_cases).simulate()
+    for case in range(east_cases.shape[1]):
+        single = Phase3DofRocketSimulator(**nominal, wind_altitudes=altitudes, wind_east=east_cases[:, case]).simulate()
+        print(f"Case {case}: Landing East (m) {single['Landing East (m)']:.3f}, batched {batch['Landing East (m)'][case]:.3f}")
+        assert abs(single["Landing East (m)"] - batch["Landing East (m)"][case]) < 0.1
+
+
+# test_vertical_calm_matches_phase2()
+# test_rail_exit()
+# test_wind_table_shapes()
+
+# Example usage
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    altitudes = [0.0, 100.0, 300.0, 1000.0]
+    base_east = np.array([3.0, 5.0, 7.0, 10.0])
+
+    sim = Phase3DofRocketSimulator(
+        md=0.8,
+        mp=0.2,
+        D=0.05,
+        burn_time=2.0,
+        thrust_func=linear_thrust,
+        rail_length=1.5,
+        rail_elevation_deg=85.0,
+        rail_azimuth_deg=270.0,
+        wind_altitudes=altitudes,
+        wind_east=base_east,
+        wind_north=np.zeros(4)
+    )
+    results = sim.simulate()
+
+    print("\n3-DOF Rocket Simulation Results:")
+    for key, value in results.items():
+        if not isinstance(value, dict):
+            print(f"{key}: {value:.6f}")
+
+    # Wind-perturbed dispersion, all cases in one integration
+    rng = np.random.default_rng(0)
+    n_cases = 1000
+    batch = Phase3DofRocketSimulator(
+        md=0.8,
+        mp=0.2,
+        D=0.05,
+        burn_time=2.0,
+        thrust_func=linear_thrust,
+        rail_length=1.5,
+        rail_elevation_deg=85.0,
+        rail_azimuth_deg=270.0,
+        wind_altitudes=altitudes,
+        wind_east=base_east[:, None] + rng.normal(0.0, 2.0, (4, n_cases)),
+        wind_north=rng.normal(0.0, 2.0, (4, n_cases))
+    )
+    dispersion = batch.simulate()
+
+    track = results["Ground Track"]
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+    ax1.plot(track["East (m)"], track["Altitude (m)"])
+    ax1.set_xlabel("East (m)")
+    ax1.set_ylabel("Altitude (m)")
+    ax1.set_title("Trajectory")
+    ax1.grid(True)
+    ax2.scatter(dispersion["Landing East (m)"], dispersion["Landing North (m)"], s=2)
+    ax2.plot(results["Landing East (m)"], results["Landing North (m)"], 'r+', markersize=12)
+    ax2.set_xlabel("East (m)")
+    ax2.set_ylabel("North (m)")
+    ax2.set_title(f"Landing Dispersion ({n_cases} cases)")
+    ax2.set_aspect('equal')
+    ax2.grid(True)
+    plt.tight_layout()
+    plt.show()
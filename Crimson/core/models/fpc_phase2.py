@@ -1,21 +1,24 @@
 import numpy as np
-from scipy.integrate import solve_ivp
-import matplotlib.pyplot as plt
+
+from core.models.sensitivity import COMPLEX_STEP
 
 # Constants
 GRAVITY = 9.806650
 RHO0 = 1.225  # kg/m³ at sea level
 PI = np.pi
 
-class Phase2RocketSimulator:
-    def __init__(self, md, mp, D, burn_time, thrust_func, dt=0.01):
+class RocketModel:
+    # Vehicle, motor and atmosphere models shared by the 1-D and 3-DOF simulators
+    def __init__(self, md, mp, D, burn_time, thrust_func):
         self.md = md                          # Dead mass (kg)
         self.mp = mp                          # Propellant mass (kg)
         self.D = D                            # Diameter (m)
         self.A = PI * (D ** 2) / 4            # Cross-sectional area (m²)
         self.burn_time = burn_time            # Burn duration (s)
         self.F = thrust_func                  # Thrust function F(t)
-        self.dt = dt                          # Time step for evaluation
+
+    def thrust(self, t):
+        return self.F(t) if t <= self.burn_time else 0.0
 
     def g(self, z):
         return GRAVITY - 0.000030 * z         # Gravity as a function of altitude
@@ -31,58 +34,160 @@ class Phase2RocketSimulator:
             return self.md + self.mp * (1 - t / self.burn_time)
         return self.md
 
+class Phase2RocketSimulator(RocketModel):
+    def __init__(self, md, mp, D, burn_time, thrust_func, dt=0.01):
+        super().__init__(md, mp, D, burn_time, thrust_func)
+        self.dt = dt                          # Time step for evaluation
+
     def acceleration(self, t, y):
         z, v = y
         m = self.mass(t)
-        F = self.F(t) if t <= self.burn_time else 0.0
+        F = self.thrust(t)
         Cd = self.Cd(z)
         rho = self.rho(z)
         g = self.g(z)
         drag = 0.5 * Cd * rho * self.A * v ** 2 / m
-        drag *= np.sign(v)
+        drag *= np.sign(np.real(v))           # real part keeps complex-step derivatives valid
         return [v, (F / m) - g - drag]
 
-    def simulate(self):
-        y0 = [0, 0]  # Initial conditions: [altitude, velocity]
+    def _integrate(self, rhs, y0, burnout_jump=None):
+        from scipy.integrate import solve_ivp
 
         # --- Burn Phase ---
+        t_eval = np.arange(0, self.burn_time, self.dt)
         sol_burn = solve_ivp(
-            self.acceleration,
+            rhs,
             [0, self.burn_time],
             y0,
-            t_eval=np.arange(0, self.burn_time, self.dt),
+            t_eval=np.append(t_eval[t_eval < self.burn_time], self.burn_time),
             rtol=1e-8,
             atol=1e-8
         )
 
-        z_burn, v_burn = sol_burn.y[0][-1], sol_burn.y[1][-1]
-        t_burnout = sol_burn.t[-1]
+        y_burnout = sol_burn.y[:, -1]
+        if burnout_jump is not None:
+            y_burnout = burnout_jump(y_burnout)
 
         # --- Coast Phase ---
         def stop_at_apogee(t, y): return y[1]
         stop_at_apogee.terminal = True
         stop_at_apogee.direction = -1
 
+        # Start just after burnout so the first step already sees no thrust
+        t_coast = np.nextafter(self.burn_time, np.inf)
         sol_coast = solve_ivp(
-            self.acceleration,
-            [t_burnout, t_burnout + 30],
-            [z_burn, v_burn],
+            rhs,
+            [t_coast, t_coast + 30],
+            y_burnout,
             events=stop_at_apogee,
             rtol=1e-8,
             atol=1e-8
         )
 
-        z_peak = sol_coast.y[0][-1]
+        return sol_burn, sol_coast
+
+    def simulate(self):
+        y0 = [0, 0]  # Initial conditions: [altitude, velocity]
+        sol_burn, sol_coast = self._integrate(self.acceleration, y0)
+
+        return {
+            "Burnout Altitude (m)": sol_burn.y[0][-1],
+            "Burnout Velocity (m/s)": sol_burn.y[1][-1],
+            "Time to Burnout (s)": sol_burn.t[-1],
+            "Peak Altitude (m)": sol_coast.y[0][-1],
+            "Time to Apogee (s)": sol_coast.t[-1],
+            "Burn Profile": sol_burn,
+            "Coast Profile": sol_coast
+        }
+
+    SENSITIVITY_PARAMETERS = ("md", "mp", "D", "burn_time", "thrust_scale")
+
+    def sensitivity_derivatives(self, t, y):
+        # State: [z, v, dz/dp..., dv/dp...] for p in SENSITIVITY_PARAMETERS
+        n = len(self.SENSITIVITY_PARAMETERS)
+        z, v = y[0], y[1]
+        Sz, Sv = np.asarray(y[2:2 + n]), np.asarray(y[2 + n:])
+        m = self.mass(t)
+        burning = t <= self.burn_time
+        F = self.thrust(t)
+        Cd = self.Cd(z)
+        rho = self.rho(z)
+        drag_force = 0.5 * Cd * rho * self.A * v * abs(v)
+
+        # Partial derivatives of dv/dt w.r.t. the state, by complex step
+        # through acceleration() so they follow the g/rho/Cd models
+        h = COMPLEX_STEP
+        a_z = np.imag(self.acceleration(t, [z + 1j * h, v])[1]) / h
+        a_v = np.imag(self.acceleration(t, [z, v + 1j * h])[1]) / h
+
+        # ... and w.r.t. the parameters
+        dm_dp = np.array([
+            1.0,
+            (1 - t / self.burn_time) if burning else 0.0,
+            0.0,
+            self.mp * t / self.burn_time ** 2 if burning else 0.0,
+            0.0,
+        ])
+        a_m = -(F - drag_force) / m ** 2
+        a_D = -0.5 * Cd * rho * v * abs(v) * (PI * self.D / 2) / m
+        a_p = a_m * dm_dp + np.array([0.0, 0.0, a_D, 0.0, F / m])
+
+        dz, dv = self.acceleration(t, [z, v])
+        return [dz, dv, *Sv, *(a_z * Sz + a_v * Sv + a_p)]
+
+    def simulate_with_sensitivities(self):
+        """
+        Run simulate() while integrating the forward sensitivity equations
+        alongside the trajectory, giving derivatives of the results from a
+        single pass with respect to md, mp, D, burn_time and thrust_scale
+        (a factor on thrust_func, nominally 1).
+        thrust_func itself is taken as independent of burn_time; moving
+        burnout adds the jump condition dv/dp += F(tb) / md at cutoff.
+        Returns:
+            The simulate() results plus "Sensitivities", a dictionary of
+            {output: {parameter: derivative}}
+        """
+        params = self.SENSITIVITY_PARAMETERS
+        n = len(params)
+        tb = params.index("burn_time")
+        F_cutoff = self.F(self.burn_time)
+
+        def burnout_jump(y):
+            y = y.copy()
+            y[2 + n + tb] += F_cutoff / self.md
+            return y
+
+        sol_burn, sol_coast = self._integrate(self.sensitivity_derivatives, [0] * (2 + 2 * n), burnout_jump)
+
+        y_burn = sol_burn.y[:, -1]
+        y_peak = sol_coast.y[:, -1]
         t_apogee = sol_coast.t[-1]
 
+        # Burnout values are read at t = burn_time, which itself moves with
+        # burn_time
+        dz_burn = y_burn[2:2 + n].copy()
+        dv_burn = y_burn[2 + n:].copy()
+        dz_burn[tb] += y_burn[1]
+        dv_burn[tb] += self.acceleration(self.burn_time, y_burn[:2])[1]
+
+        # At apogee v = 0, so dz_peak/dp is the state sensitivity itself and
+        # the apogee time shifts by -(dv/dp) / (dv/dt).
+        a_peak = self.acceleration(t_apogee, y_peak[:2])[1]
+
         return {
-            "Burnout Altitude (m)": z_burn,
-            "Burnout Velocity (m/s)": v_burn,
-            "Time to Burnout (s)": t_burnout,
-            "Peak Altitude (m)": z_peak,
+            "Burnout Altitude (m)": y_burn[0],
+            "Burnout Velocity (m/s)": y_burn[1],
+            "Time to Burnout (s)": sol_burn.t[-1],
+            "Peak Altitude (m)": y_peak[0],
             "Time to Apogee (s)": t_apogee,
             "Burn Profile": sol_burn,
-            "Coast Profile": sol_coast
+            "Coast Profile": sol_coast,
+            "Sensitivities": {
+                "Burnout Altitude (m)": dict(zip(params, dz_burn)),
+                "Burnout Velocity (m/s)": dict(zip(params, dv_burn)),
+                "Peak Altitude (m)": dict(zip(params, y_peak[2:2 + n])),
+                "Time to Apogee (s)": dict(zip(params, -y_peak[2 + n:] / a_peak)),
+            }
         }
 
 # Example thrust function — linearly decreasing thrust
@@ -90,8 +195,37 @@ def linear_thrust(t):
     F0 = 50.0  # N
     return F0 * (1 - 0.2 * t) if t <= 2.0 else 0.0
 
+def test_simulate_with_sensitivities():
+    # Forward sensitivities against central differences. The thrust curve
+    # has no cutoff of its own so that burn_time can be perturbed.
+    def thrust(t): return 50.0 * (1 - 0.2 * t)
+    nominal = dict(md=0.8, mp=0.2, D=0.05, burn_time=2.0, thrust_func=thrust)
+    sensitivities = Phase2RocketSimulator(**nominal).simulate_with_sensitivities()["Sensitivities"]
+
+    for param in Phase2RocketSimulator.SENSITIVITY_PARAMETERS:
+        results = []
+        for sign in (1, -1):
+            perturbed = dict(nominal)
+            if param == "thrust_scale":
+                h = 1e-5
+                perturbed["thrust_func"] = lambda t, s=sign: (1 + s * h) * thrust(t)
+            else:
+                h = 1e-5 * nominal[param]
+                perturbed[param] += sign * h
+            results.append(Phase2RocketSimulator(**perturbed).simulate())
+
+        for output, derivatives in sensitivities.items():
+            central = (results[0][output] - results[1][output]) / (2 * h)
+            print(f"d({output})/d({param}): {derivatives[param]:.6f} (central difference {central:.6f})")
+            assert abs(derivatives[param] - central) <= 1e-3 * abs(central)
+
+
+# test_simulate_with_sensitivities()
+
 # Example usage
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     sim = Phase2RocketSimulator(
         md=0.8,
         mp=0.2,
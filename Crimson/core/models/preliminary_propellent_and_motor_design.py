@@ -1,4 +1,4 @@
-import math
+import numpy as np
 
 GRAVITY = 32.2  # ft/s²
 
@@ -22,25 +22,29 @@ def calculate_motor_parameters(
     thrust_weight_ratio = acceleration + 1  # dimensionless
 
     denominator = (propellant_mass_fraction / thrust_weight_ratio) - (burn_time / c_star_theoretical)
-    if denominator == 0:
+    if np.any(denominator == 0):
         raise ValueError("Division by zero in thrust calculation. Check inputs.")
 
     # Basic thrust parameters
     thrust = (propellant_mass_fraction * empty_rocket_weight) / denominator
+    if np.any(np.real(thrust) <= 0):
+        raise ValueError("Non-positive thrust. Check inputs.")
     liftoff_weight = thrust / thrust_weight_ratio
     motor_weight = liftoff_weight - empty_rocket_weight
     propellant_weight = motor_weight * propellant_mass_fraction
 
     # Exit cone and divergence
-    exit_angle_rad = math.radians(exit_cone_angle_deg)
-    divergence_factor = 1 + (math.cos(exit_angle_rad) * exit_cone_efficiency)
+    exit_angle_rad = exit_cone_angle_deg * np.pi / 180
+    divergence_factor = 1 + (np.cos(exit_angle_rad) * exit_cone_efficiency)
     delivered_thrust_coefficient = thrust_coefficient * divergence_factor * exit_cone_efficiency
     delivered_specific_impulse = (delivered_thrust_coefficient * c_star_theoretical * combustion_efficiency) / GRAVITY
 
     # Throat properties
     propellant_weight_flow = thrust / delivered_thrust_coefficient
     throat_area = thrust / (delivered_thrust_coefficient * chamber_pressure)
-    throat_radius = math.sqrt(throat_area / math.pi)
+    if np.any(np.real(throat_area) <= 0):
+        raise ValueError("Non-positive throat area. Check inputs.")
+    throat_radius = np.sqrt(throat_area / np.pi)
     throat_diameter = 2 * throat_radius
 
     # Bore and burn properties
@@ -59,10 +63,10 @@ def calculate_motor_parameters(
     final_propellant_length = initial_propellant_length - (2 * web_thickness)
 
     initial_cartridge_ablation = (
-        2 * ((math.pi / 4) * (propellant_outer_diameter ** 2 - bore_diameter ** 2)) +
-        math.pi * initial_propellant_length * bore_diameter
+        2 * ((np.pi / 4) * (propellant_outer_diameter ** 2 - bore_diameter ** 2)) +
+        np.pi * initial_propellant_length * bore_diameter
     )
-    final_cartridge_ablation = math.pi * propellant_outer_diameter * final_propellant_length
+    final_cartridge_ablation = np.pi * propellant_outer_diameter * final_propellant_length
 
     target_ablation = propellant_weight_flow / (density * burnrate)
     no_of_propellant_cartridge = target_ablation / final_cartridge_ablation
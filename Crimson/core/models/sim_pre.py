@@ -1,6 +1,4 @@
 import numpy as np
-from scipy.integrate import solve_ivp
-import matplotlib.pyplot as plt
 
 # === Constants ===
 GRAVITY = 32.2
@@ -65,59 +63,83 @@ def chamber_ode(t, y, params):
     return [dmpdt, dPdt, dTdt]
 
 # === Integration ===
-params = (rho, bore_d, a, n, Vc, ce0)
-y0 = [initial_mass, initial_pressure, initial_temperature]
-t_eval = np.linspace(0, 2, 500)
-
-sol = solve_ivp(
-    lambda t, y: chamber_ode(t, y, params),
-    [0, 2],
-    y0,
-    t_eval=t_eval,
-    rtol=1e-8,
-    atol=1e-8
-)
-
-# === Extract Results ===
-time = sol.t
-mass, pressure, temperature = sol.y
-throat_areas = np.array([throat_area(t) for t in time])
-efficiencies = np.array([combustion_efficiency(t, ce0) for t in time])
-isp_values = specific_impulse(C_STAR_REF, efficiencies, temperature)
+def simulate_chamber(t_end=2.0, n_points=500):
+    from scipy.integrate import solve_ivp
+
+    params = (rho, bore_d, a, n, Vc, ce0)
+    y0 = [initial_mass, initial_pressure, initial_temperature]
+    t_eval = np.linspace(0, t_end, n_points)
+
+    sol = solve_ivp(
+        lambda t, y: chamber_ode(t, y, params),
+        [0, t_end],
+        y0,
+        t_eval=t_eval,
+        rtol=1e-8,
+        atol=1e-8
+    )
+
+    # === Extract Results ===
+    time = sol.t
+    mass, pressure, temperature = sol.y
+    throat_areas = np.array([throat_area(t) for t in time])
+    efficiencies = np.array([combustion_efficiency(t, ce0) for t in time])
+    isp_values = specific_impulse(C_STAR_REF, efficiencies, temperature)
+
+    return {
+        "Time (s)": time,
+        "Propellant Mass (lb)": mass,
+        "Chamber Pressure (psi)": pressure,
+        "Temperature (R)": temperature,
+        "Throat Area (in²)": throat_areas,
+        "Delivered ISP (s)": isp_values,
+    }
 
 # === Plotting in 2x2 Grid ===
-fig, axs = plt.subplots(nrows=2, ncols=2, figsize=(12, 8), sharex=True)
-
-# Top Left
-axs[0, 0].plot(time, pressure, color='red', label='Chamber Pressure')
-axs[0, 0].set_ylabel("Pressure (psi)")
-axs[0, 0].set_title("Chamber Pressure vs Time")
-axs[0, 0].grid(True)
-axs[0, 0].legend()
-
-# Top Right
-axs[0, 1].plot(time, mass, color='blue', label='Propellant Mass')
-axs[0, 1].set_ylabel("Mass (lb)")
-axs[0, 1].set_title("Propellant Mass vs Time")
-axs[0, 1].grid(True)
-axs[0, 1].legend()
-
-# Bottom Left
-axs[1, 0].plot(time, throat_areas, color='green', label='Throat Area')
-axs[1, 0].set_ylabel("Area (in²)")
-axs[1, 0].set_xlabel("Time (s)")
-axs[1, 0].set_title("Throat Area vs Time")
-axs[1, 0].grid(True)
-axs[1, 0].legend()
-
-# Bottom Right
-axs[1, 1].plot(time, isp_values, color='purple', label='Delivered ISP')
-axs[1, 1].set_ylabel("ISP (s)")
-axs[1, 1].set_xlabel("Time (s)")
-axs[1, 1].set_title("Delivered ISP vs Time")
-axs[1, 1].grid(True)
-axs[1, 1].legend()
-
-plt.suptitle("Advanced Internal Ballistics Simulation")
-plt.tight_layout(rect=[0, 0, 1, 0.96])  # leave room for suptitle
-plt.show()
+def plot_chamber(results):
+    import matplotlib.pyplot as plt
+
+    time = results["Time (s)"]
+    pressure = results["Chamber Pressure (psi)"]
+    mass = results["Propellant Mass (lb)"]
+    throat_areas = results["Throat Area (in²)"]
+    isp_values = results["Delivered ISP (s)"]
+
+    fig, axs = plt.subplots(nrows=2, ncols=2, figsize=(12, 8), sharex=True)
+
+    # Top Left
+    axs[0, 0].plot(time, pressure, color='red', label='Chamber Pressure')
+    axs[0, 0].set_ylabel("Pressure (psi)")
+    axs[0, 0].set_title("Chamber Pressure vs Time")
+    axs[0, 0].grid(True)
+    axs[0, 0].legend()
+
+    # Top Right
+    axs[0, 1].plot(time, mass, color='blue', label='Propellant Mass')
+    axs[0, 1].set_ylabel("Mass (lb)")
+    axs[0, 1].set_title("Propellant Mass vs Time")
+    axs[0, 1].grid(True)
+    axs[0, 1].legend()
+
+    # Bottom Left
+    axs[1, 0].plot(time, throat_areas, color='green', label='Throat Area')
+    axs[1, 0].set_ylabel("Area (in²)")
+    axs[1, 0].set_xlabel("Time (s)")
+    axs[1, 0].set_title("Throat Area vs Time")
+    axs[1, 0].grid(True)
+    axs[1, 0].legend()
+
+    # Bottom Right
+    axs[1, 1].plot(time, isp_values, color='purple', label='Delivered ISP')
+    axs[1, 1].set_ylabel("ISP (s)")
+    axs[1, 1].set_xlabel("Time (s)")
+    axs[1, 1].set_title("Delivered ISP vs Time")
+    axs[1, 1].grid(True)
+    axs[1, 1].legend()
+
+    plt.suptitle("Advanced Internal Ballistics Simulation")
+    plt.tight_layout(rect=[0, 0, 1, 0.96])  # leave room for suptitle
+    plt.show()
+
+if __name__ == "__main__":
+    plot_chamber(simulate_chamber())
@@ -0,0 +1,361 @@
+import io
+import mmap
+import os
+
+import numpy as np
+
+# imperial, matching the ballistics models
+
+GRAVITY = 32.2  # ft/s²
+
+# Measured result -> output keys of motor_ballistic_performance_numpy and
+# calculate_motor_parameters it is compared against
+MODEL_KEYS = {
+    "Average Thrust (lbf)": ("Thrust", "Thrust (lbf)"),
+    "Average Chamber Pressure (psi)": ("Chamber_Pressure",),
+    "Burn Time (s)": ("Burn_Time",),
+    "C* (ft/s)": ("C_Star",),
+    "Thrust Coefficient": ("Thrust_Coefficient", "Delivered Thrust Coefficient"),
+    "Specific Impulse (s)": ("Delivered Specific Impulse (s)",),
+    "Burn Rate (in/s)": ("Burn Rate (in/s)",),
+}
+
+
+def read_binary_chunks(filepath, n_columns, dtype='<f4', header_bytes=0, chunk_rows=1_000_000):
+    """
+    Memory-map a raw binary log of interleaved samples and yield it in blocks.
+    Inputs:
+        filepath: Path to the log
+        n_columns: Number of values per sample (e.g. time, thrust, pressure)
+        dtype: Sample dtype as written by the DAQ
+        header_bytes: Bytes to skip at the start of the file
+        chunk_rows: Samples per block
+    Returns:
+        Generator of (chunk_rows x n_columns) arrays. The blocks are views of
+        the mapping, which stays open until the generator is exhausted or
+        closed and no block is referenced any more.
+    """
+    # Whole samples only; a sample cut short at the end of the file is dropped
+    n_rows = (os.path.getsize(filepath) - header_bytes) // (np.dtype(dtype).itemsize * n_columns)
+    if n_rows <= 0:
+        return
+
+    samples = np.memmap(filepath, dtype=dtype, mode='r', offset=header_bytes, shape=(n_rows, n_columns))
+    try:
+        for start in range(0, n_rows, chunk_rows):
+            yield samples[start:start + chunk_rows]
+    finally:
+        del samples
+
+
+def read_csv_chunks(filepath, delimiter=',', skip_header=1, chunk_bytes=64 * 1024 ** 2):
+    """
+    Memory-map a delimited text log and parse it in blocks of whole lines.
+    Inputs:
+        filepath: Path to the log
+        delimiter: Column delimiter
+        skip_header: Number of header lines
+        chunk_bytes: Approximate bytes parsed per block
+    Returns:
+        Generator of (rows x columns) arrays
+    """
+    if os.path.getsize(filepath) == 0:
+        return
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        pos = 0
+        for _ in range(skip_header):
+            pos = mm.find(b'\n', pos) + 1
+            if pos == 0:
+                return
+
+        while pos < size:
+            end = min(pos + chunk_bytes, size)
+            if end < size:
+                # Cut at the last full line; fall back to the next newline
+                # when a single line is longer than the block
+                newline = mm.rfind(b'\n', pos, end)
+                if newline < 0:
+                    newline = mm.find(b'\n', end)
+                end = size if newline < 0 else newline + 1
+            block = np.loadtxt(io.BytesIO(mm[pos:end]), delimiter=delimiter, ndmin=2)
+            pos = end
+            if len(block):
+                yield block
+
+
+def _trapezoid(t, y):
+    return np.sum(0.5 * (y[1:] + y[:-1]) * np.diff(t))
+
+
+class StaticFireReducer:
+    """
+    Incremental reduction of static-fire thrust and chamber pressure data.
+    Feed samples chunk by chunk with update(); only running integrals and
+    the filter state are kept, so logs of any length use constant memory.
+
+    Both channels are tared with the mean of the first pre-ignition samples.
+    The burn runs from the first sample where the low-pass filtered thrust
+    exceeds thrust_threshold to the first sample after that where it drops
+    below it. Impulse, the pressure integral and the peaks use the
+    unfiltered data.
+    """
+
+    def __init__(
+        self,
+        throat_area,             # in²
+        propellant_weight,       # lbs
+        web_thickness=None,      # inches, for the average burn rate
+        thrust_threshold=5.0,    # lbf
+        cutoff_frequency=50.0,   # Hz, low-pass filter for burn detection
+        sample_rate=None,        # Hz, estimated from the first chunk if None
+        tare_samples=100,
+    ):
+        self.throat_area = throat_area
+        self.propellant_weight = propellant_weight
+        self.web_thickness = web_thickness
+        self.thrust_threshold = thrust_threshold
+        self.cutoff_frequency = cutoff_frequency
+        self.sample_rate = sample_rate
+        self.tare_samples = tare_samples
+
+        self._sos = None
+        self._zi = None
+        self._tare = None
+        self._pending = []  # chunks held back until the tare window is full
+        self._state = "waiting"
+        self._last = None  # last in-burn sample (t, thrust, pressure)
+
+        self.burn_start = np.nan
+        self.burn_end = np.nan
+        self.total_impulse = 0.0
+        self.pressure_integral = 0.0
+        self.peak_thrust = 0.0
+        self.peak_pressure = 0.0
+        self.n_samples = 0
+
+    def _start(self, t, thrust, pressure):
+        from scipy.signal import butter, sosfilt_zi
+
+        if len(t) < 2 and self.sample_rate is None:
+            raise ValueError("Need at least two samples to estimate the sample rate.")
+
+        n_tare = min(self.tare_samples, len(t))
+        self._tare = (np.mean(thrust[:n_tare]), np.mean(pressure[:n_tare]))
+
+        if self.sample_rate is None:
+            self.sample_rate = 1.0 / np.median(np.diff(t))
+        cutoff = min(self.cutoff_frequency, 0.45 * self.sample_rate)
+        self._sos = butter(2, cutoff, fs=self.sample_rate, output='sos')
+        self._zi = sosfilt_zi(self._sos) * (thrust[0] - self._tare[0])
+
+    def update(self, t, thrust, pressure):
+        """
+        Process the next chunk of samples.
+        Inputs:
+            t: Sample times (s)
+            thrust: Load cell readings (lbf)
+            pressure: Chamber pressure readings (psi)
+        """
+        from scipy.signal import sosfilt
+
+        t = np.asarray(t, dtype=float)
+        thrust = np.asarray(thrust, dtype=float)
+        pressure = np.asarray(pressure, dtype=float)
+        if len(t) == 0:
+            return
+        if self._state == "done":
+            # Nothing after burnout is needed; skip the filter entirely
+            self.n_samples += len(t)
+            return
+        if self._tare is None:
+            self._pending.append((t, thrust, pressure))
+            if sum(len(chunk[0]) for chunk in self._pending) < self.tare_samples:
+                return
+            t, thrust, pressure = (np.concatenate(column) for column in zip(*self._pending))
+            self._pending = []
+            self._start(t, thrust, pressure)
+
+        self.n_samples += len(t)
+        thrust = thrust - self._tare[0]
+        pressure = pressure - self._tare[1]
+        filtered, self._zi = sosfilt(self._sos, thrust, zi=self._zi)
+
+        start = 0
+        if self._state == "waiting":
+            ignited = np.flatnonzero(filtered >= self.thrust_threshold)
+            if len(ignited) == 0:
+                return
+            start = ignited[0]
+            self.burn_start = t[start]
+            self._state = "burning"
+
+        stop = len(t)
+        burned_out = np.flatnonzero(filtered[start:] < self.thrust_threshold)
+        if len(burned_out):
+            stop = start + burned_out[0] + 1
+            self._state = "done"
+
+        seg_t, seg_thrust, seg_pressure = t[start:stop], thrust[start:stop], pressure[start:stop]
+        if self._last is not None:
+            seg_t = np.concatenate([[self._last[0]], seg_t])
+            seg_thrust = np.concatenate([[self._last[1]], seg_thrust])
+            seg_pressure = np.concatenate([[self._last[2]], seg_pressure])
+
+        self.total_impulse += _trapezoid(seg_t, seg_thrust)
+        self.pressure_integral += _trapezoid(seg_t, seg_pressure)
+        self.peak_thrust = max(self.peak_thrust, np.max(thrust[start:stop]))
+        self.peak_pressure = max(self.peak_pressure, np.max(pressure[start:stop]))
+        self.burn_end = seg_t[-1]
+        self._last = (seg_t[-1], seg_thrust[-1], seg_pressure[-1])
+
+    def results(self):
+        """
+        Returns:
+            Dictionary of measured performance; c*, Isp and thrust
+            coefficient use the throat area and propellant weight given
+        """
+        if self._pending:
+            # Log shorter than the tare window
+            t, thrust, pressure = (np.concatenate(column) for column in zip(*self._pending))
+            self._pending = []
+            self._start(t, thrust, pressure)
+            self.update(t, thrust, pressure)
+
+        if self._state == "waiting":
+            raise ValueError("No burn detected: filtered thrust never reached the threshold.")
+
+        burn_time = self.burn_end - self.burn_start
+        burn_rate = np.nan
+        if self.web_thickness is not None:
+            burn_rate = self.web_thickness / burn_time
+
+        return {
+            "Burn Start (s)": self.burn_start,
+            "Burn End (s)": self.burn_end,
+            "Burn Time (s)": burn_time,
+            "Total Impulse (lbf·s)": self.total_impulse,
+            "Average Thrust (lbf)": self.total_impulse / burn_time,
+            "Peak Thrust (lbf)": self.peak_thrust,
+            "Pressure Integral (psi·s)": self.pressure_integral,
+            "Average Chamber Pressure (psi)": self.pressure_integral / burn_time,
+            "Peak Chamber Pressure (psi)": self.peak_pressure,
+            "C* (ft/s)": GRAVITY * self.throat_area * self.pressure_integral / self.propellant_weight,
+            "Thrust Coefficient": self.total_impulse / (self.throat_area * self.pressure_integral),
+            "Specific Impulse (s)": self.total_impulse / self.propellant_weight,
+            "Burn Rate (in/s)": burn_rate,
+            "Samples": self.n_samples,
+        }
+
+
+def reduce_static_fire(chunks, throat_area, propellant_weight, columns=(0, 1, 2), **options):
+    """
+    Run a StaticFireReducer over chunks from read_binary_chunks or
+    read_csv_chunks.
+    Inputs:
+        chunks: Iterable of (rows x columns) sample arrays
+        throat_area: Nozzle throat area (in²)
+        propellant_weight: Propellant weight (lbs)
+        columns: Column indices of time, thrust and pressure
+        options: Further StaticFireReducer arguments
+    Returns:
+        Dictionary of measured performance
+    """
+    reducer = StaticFireReducer(throat_area, propellant_weight, **options)
+    time_col, thrust_col, pressure_col = columns
+    for chunk in chunks:
+        reducer.update(chunk[:, time_col], chunk[:, thrust_col], chunk[:, pressure_col])
+    return reducer.results()
+
+
+def fit_burn_rate(chamber_pressures, burn_rates):
+    """
+    Fit Saint Robert's law r = a * P^n to a series of firings.
+    Inputs:
+        chamber_pressures: Average chamber pressure of each test (psi)
+        burn_rates: Average burn rate of each test (in/s)
+    Returns:
+        Dictionary with the burnrate coefficient and exponent
+    """
+    exponent, log_coefficient = np.polyfit(np.log(chamber_pressures), np.log(burn_rates), 1)
+    return {
+        "Burnrate Coefficient": np.exp(log_coefficient),
+        "Burnrate Exponent": exponent,
+    }
+
+
+def compare_with_model(measured, predicted):
+    """
+    Compare reduced test data with model predictions.
+    Inputs:
+        measured: Result of StaticFireReducer.results()
+        predicted: Output of motor_ballistic_performance_numpy and/or
+            calculate_motor_parameters (dictionaries may be merged)
+    Returns:
+        Dictionary of {quantity: {Measured, Predicted, Error (%)}}
+    """
+    comparison = {}
+    for key, model_keys in MODEL_KEYS.items():
+        for model_key in model_keys:
+            if model_key in predicted and not np.isnan(measured[key]):
+                prediction = predicted[model_key]
+                comparison[key] = {
+                    "Measured": measured[key],
+                    "Predicted": prediction,
+                    "Error (%)": 100 * (measured[key] - prediction) / prediction,
+                }
+                break
+    return comparison
+
+
+def _write_synthetic_log(directory, sample_rate=2000.0, duration=10.0):
+    # 100 lbf / 500 psi burn from 3 s to 5 s with offsets and sensor noise
+    t = np.arange(0.0, duration, 1.0 / sample_rate)
+    burning = (t > 3.0) & (t < 5.0)
+    rng = np.random.default_rng(0)
+    thrust = np.where(burning, 100.0, 0.0) + 2.0 + rng.normal(0.0, 1.0, len(t))
+    pressure = np.where(burning, 500.0, 0.0) + 1.0 + rng.normal(0.0, 3.0, len(t))
+    samples = np.column_stack([t, thrust, pressure])
+
+    binary_path = os.path.join(directory, "static_fire.bin")
+    csv_path = os.path.join(directory, "static_fire.csv")
+    samples.astype('<f8').tofile(binary_path)
+    np.savetxt(csv_path, samples, delimiter=',', header="time,thrust,pressure", comments='')
+    return binary_path, csv_path
+
+
+def test_chunk_size_independence():
+    # Reduced results must not depend on how the log is split into chunks
+    import tempfile
+
+    options = dict(throat_area=0.2, propellant_weight=0.5, web_thickness=0.4, thrust_threshold=10.0)
+    with tempfile.TemporaryDirectory() as directory:
+        binary_path, csv_path = _write_synthetic_log(directory)
+        reference = reduce_static_fire(read_binary_chunks(binary_path, 3, dtype='<f8'), **options)
+        runs = [reduce_static_fire(read_binary_chunks(binary_path, 3, dtype='<f8', chunk_rows=rows), **options)
+                for rows in (7, 50, 777)]
+        runs.append(reduce_static_fire(read_csv_chunks(csv_path, chunk_bytes=10000), **options))
+
+        empty_path = os.path.join(directory, "empty.csv")
+        open(empty_path, 'w').close()
+        assert list(read_csv_chunks(empty_path)) == []
+        assert list(read_binary_chunks(empty_path, 3)) == []
+
+        # Log cut off partway through a sample: the partial sample is ignored
+        truncated_path = os.path.join(directory, "truncated.bin")
+        with open(truncated_path, 'wb') as f:
+            f.write(np.arange(30, dtype='<f4').tobytes() + b'\x00\x00')
+        chunks = list(read_binary_chunks(truncated_path, 3, chunk_rows=4))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        assert np.array_equal(np.concatenate(chunks), np.arange(30, dtype='<f4').reshape(10, 3))
+        del chunks
+
+    print(f"Total Impulse (lbf·s): {reference['Total Impulse (lbf·s)']}")
+    assert abs(reference["Total Impulse (lbf·s)"] - 200.0) < 1.0
+    for result in runs:
+        for key, value in reference.items():
+            assert np.isclose(result[key], value, rtol=1e-9, equal_nan=True), key
+
+
+# test_chunk_size_independence()
@@ -1,4 +1,4 @@
-import math
+import numpy as np
 
 def chamber_failure(meop, chamber_diameter, tensile_strength_ch):
     """
@@ -28,7 +28,9 @@ def nozzle_failure(meop, nozzle_radius, throat_radius, k, tensile_strength_nz):
         min_wall_thickness_nz: Minimum wall thickness (inch)
     """
     stress_concentration_ratio_nz = nozzle_radius / throat_radius
-    min_wall_thickness_nz = math.sqrt((k * meop * (nozzle_radius ** 2)) / tensile_strength_nz)
+    if np.any(np.real(k * meop / tensile_strength_nz) < 0):
+        raise ValueError("Negative value under square root in nozzle wall thickness. Check inputs.")
+    min_wall_thickness_nz = np.sqrt((k * meop * (nozzle_radius ** 2)) / tensile_strength_nz)
     return {
         "Stress Concentration Ratio Nozzle": stress_concentration_ratio_nz,
         "Min Wall Thickness Nozzle (inch)": min_wall_thickness_nz
@@ -47,7 +49,9 @@ def bulkhead_failure(meop, bulkhead_radius, delay_charge_radius, k, tensile_stre
         min_wall_thickness_bh: Minimum wall thickness (inch)
     """
     stress_concentration_ratio_bh = bulkhead_radius / delay_charge_radius
-    min_wall_thickness_bh = math.sqrt((k * meop * (bulkhead_radius ** 2)) / tensile_strength_bh)
+    if np.any(np.real(k * meop / tensile_strength_bh) < 0):
+        raise ValueError("Negative value under square root in bulkhead wall thickness. Check inputs.")
+    min_wall_thickness_bh = np.sqrt((k * meop * (bulkhead_radius ** 2)) / tensile_strength_bh)
     return {
         "Stress Concentration Ratio Bulkhead": stress_concentration_ratio_bh,
         "Min Wall Thickness Bulkhead (inch)": min_wall_thickness_bh
@@ -68,7 +72,9 @@ def retaining_pins(meop, bulkhead_radius, number_of_pins, tensile_strength_rp):
     """
     bulkhead_ejection_force = meop * 3.13999999999942 * (bulkhead_radius ** 3)
     retaining_pin_load = bulkhead_ejection_force / number_of_pins
-    min_retaining_pin_diameter = 2 * math.sqrt(retaining_pin_load / (3.13999999999942 * tensile_strength_rp))
+    if np.any(np.real(retaining_pin_load / tensile_strength_rp) < 0):
+        raise ValueError("Negative value under square root in retaining pin diameter. Check inputs.")
+    min_retaining_pin_diameter = 2 * np.sqrt(retaining_pin_load / (3.13999999999942 * tensile_strength_rp))
     return {
         "Bulkhead Ejection Force (lbs)": bulkhead_ejection_force,
         "Retaining Pin Load (lbs)": retaining_pin_load,
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+# Importing the models must not pull in SciPy or matplotlib, and should stay
+# well under the GUI's startup budget.
+HEAVY_MODULES = ("scipy", "matplotlib")
+IMPORT_BUDGET = 1.0  # seconds
+
+IMPORT_ALL_MODELS = """
+import importlib, pkgutil, sys, time
+import core.models
+
+start = time.perf_counter()
+for module in pkgutil.iter_modules(core.models.__path__):
+    importlib.import_module("core.models." + module.name)
+elapsed = time.perf_counter() - start
+
+print(elapsed)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure_import_time():
+    """
+    Import every core.models module in a fresh interpreter.
+    Returns:
+        Import time (s) and the heavy modules that ended up loaded
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_ALL_MODELS.format(heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    ).stdout.splitlines()
+    loaded = [name for name in output[1].split(",") if name]
+    return float(output[0]), loaded
+
+
+def test_import_budget(budget=IMPORT_BUDGET):
+    elapsed, loaded = measure_import_time()
+    print(f"core.models import time: {elapsed:.3f} s")
+    assert not loaded, f"Heavy modules imported at module level: {', '.join(loaded)}"
+    if budget is not None:
+        assert elapsed < budget, f"Import took {elapsed:.3f} s, budget is {budget:.3f} s"
+
+
+if __name__ == "__main__":
+    test_import_budget()